@@ -8,9 +8,10 @@ from app.RAG.deepseek_client import DeepSeekClient
 from app.RAG.prompt import get_system_prompt
 from app.config import Settings
 from app.api.chat.models.chat_model import ChatRequest
-from tools.tools_schema import retrieval_tool, search_articles, weather_tool
-from tools.functions import execute_tool
+from tools.tools_schema import ALL_TOOLS
+from tools.functions import execute_tool_async
 from loguru import logger
+import asyncio
 import json
 
 
@@ -71,7 +72,7 @@ async def execute_rag_chain(request: ChatRequest, collection_name: str, settings
     logger.info("[RAG_CHAIN] Making DeepSeek call with tools")
     response = deepseek.chat_completion(
         messages=messages,
-        tools=[retrieval_tool, search_articles, weather_tool],
+        tools=list(ALL_TOOLS),
         tool_choice="auto",
         temperature=0.6
     )
@@ -91,21 +92,28 @@ async def execute_rag_chain(request: ChatRequest, collection_name: str, settings
     if tool_calls:
         logger.info(f"[RAG_CHAIN] Processing {len(tool_calls)} tool call(s)")
         
-        # Execute tool calls and collect results
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
-            
+        # Execute all tool calls concurrently - they're independent and
+        # network-bound, so their I/O overlaps instead of serializing
+        parsed_calls = [
+            (tool_call, tool_call.function.name, json.loads(tool_call.function.arguments))
+            for tool_call in tool_calls
+        ]
+        for _, function_name, function_args in parsed_calls:
             logger.info(f"[RAG_CHAIN] Executing tool: {function_name}")
             logger.info(f"[RAG_CHAIN] Tool arguments: {function_args}")
-            
-            # Execute the tool and get result, context, and token usage
-            tool_result, tool_context, tool_tokens = execute_tool(
+
+        tool_results = await asyncio.gather(*[
+            execute_tool_async(
                 function_name=function_name,
                 function_args=function_args,
                 collection_name=collection_name
             )
-            
+            for _, function_name, function_args in parsed_calls
+        ])
+
+        # Collect results in call order
+        for (tool_call, function_name, function_args), (tool_result, tool_context, tool_tokens) in zip(parsed_calls, tool_results):
+
             # Aggregate token usage from tool execution
             total_token_usage["embedding_tokens"] += tool_tokens.get("embedding_tokens", 0)
             
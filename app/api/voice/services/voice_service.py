@@ -2,18 +2,24 @@
 Voice Agent service for building Deepgram Voice Agent configuration.
 Uses existing prompt and function schemas from the application.
 """
-from typing import Dict, List
+import json
+from typing import Dict, List, Optional
 from loguru import logger
 from app.config import Settings
-from tools.tools_schema import retrieval_tool, search_articles, weather_tool
+from tools.tools_schema import ALL_TOOLS
 from app.RAG.prompt import get_voice_prompt
 
+# Serialized Settings payload, built once per process. The prompt, function
+# schemas and API keys are fixed at runtime, so every session sends the
+# identical JSON string and reconnect bursts skip the prompt-building work.
+_settings_json_cache: Optional[str] = None
+
 def get_function_definitions_openai() -> List[Dict]:
     """
     Get the function definitions in OpenAI format.
     Returns the same tools used in the chat RAG pipeline.
     """
-    return [retrieval_tool, search_articles, weather_tool]
+    return list(ALL_TOOLS)
 
 
 def convert_to_deepgram_format(openai_tools: List[Dict]) -> List[Dict]:
@@ -55,6 +61,17 @@ def get_function_definitions_deepgram() -> List[Dict]:
     return convert_to_deepgram_format(openai_tools)
 
 
+async def get_voice_agent_settings_json(settings: Settings) -> str:
+    """
+    Get the Voice Agent Settings message pre-serialized to JSON.
+    Cached after the first call so new sessions reuse the same string.
+    """
+    global _settings_json_cache
+    if _settings_json_cache is None:
+        _settings_json_cache = json.dumps(await get_voice_agent_settings(settings))
+    return _settings_json_cache
+
+
 async def get_voice_agent_settings(settings: Settings) -> Dict:
     """
     Configure Deepgram Voice Agent with DeepSeek as custom LLM.
@@ -2,32 +2,152 @@
 Voice Agent Session management.
 Handles WebSocket connection to Deepgram Voice Agent API.
 """
-import json
-import base64
 import asyncio
+import ssl
 import time
 from typing import Optional
+import orjson
 import websockets
 from fastapi import WebSocket
 from loguru import logger
 from app.config import Settings
-from app.api.voice.services.voice_service import get_voice_agent_settings
+from app.api.voice.services.voice_service import get_voice_agent_settings_json
 from tools.functions import get_current_weather, search_articles, retrieve_documents
-import traceback
 
 
+def orjson_dumps_str(obj) -> str:
+    """Serialize with orjson (much faster than stdlib json) to a str payload."""
+    return orjson.dumps(obj).decode()
+
+
+def _debug_enabled() -> bool:
+    """Whether DEBUG records would actually be emitted.
+
+    loguru evaluates message arguments eagerly, so hot-loop debug lines are
+    guarded with this to skip the f-string work entirely at INFO level.
+    Checked per call because the sink level is configured at app startup,
+    after this module is imported.
+    """
+    return logger._core.min_level <= 10
+
+
+# Pre-encoded constant control messages - serialized once at import instead
+# of a dict alloc + json.dumps per event
+_AGENT_READY = '{"type":"agent_ready"}'
+_SETTINGS_APPLIED = '{"type":"settings_applied"}'
+_SPEECH_STARTED = '{"type":"speech_started"}'
+_THINKING = '{"type":"thinking"}'
+_PLAYBACK_STARTED = '{"type":"playback_started"}'
+_PLAYBACK_FINISHED = '{"type":"playback_finished"}'
+
 # Deepgram Voice Agent V1 endpoint
 VOICE_AGENT_URL = "wss://agent.deepgram.com/v1/agent/converse"
 
+# Shared TLS context - built once (CA load is milliseconds) and reused by
+# every session so reconnects can resume TLS sessions instead of paying a
+# full handshake per connection
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.set_alpn_protocols(["http/1.1"])
+
 # Default collection for voice document retrieval
 DEFAULT_COLLECTION = "tool_calling_dev"
 
+# Upper bound on unsent bytes queued towards the agent socket - beyond this,
+# incoming mic audio is dropped instead of piling up in memory
+SEND_HIGH_WATERMARK = 256 * 1024
+
+# Coalesce mic audio into one agent-bound frame per window (seconds) to
+# amortize WebSocket frame and syscall overhead. Set to 0 to send each
+# chunk immediately if the added uplink latency is unacceptable.
+AUDIO_BATCH_WINDOW = 0.02
+
+# Same idea for TTS audio on the client-bound leg: ~50 send calls/sec per
+# session collapse into one frame per window. 0 disables.
+CLIENT_AUDIO_BATCH_WINDOW = 0.01
+
+# Short-lived cache for weather/retrieval tool results - voice users often
+# re-ask about the same city or phrase within a turn or two, and a hit skips
+# the whole external round trip the agent is waiting on
+_TOOL_CACHE_TTL = 60.0
+_TOOL_CACHE_MAX = 256
+_tool_cache: dict = {}
+
+
+def _tool_cache_get(key):
+    entry = _tool_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _tool_cache.pop(key, None)
+        return None
+    return entry[1]
+
+
+def _tool_cache_put(key, value):
+    if len(_tool_cache) >= _TOOL_CACHE_MAX:
+        # Evict the oldest insertion - close enough to LRU at this size
+        _tool_cache.pop(next(iter(_tool_cache)))
+    _tool_cache[key] = (time.monotonic() + _TOOL_CACHE_TTL, value)
+
+
+async def prewarm_voice_stack(settings: Settings):
+    """
+    Pre-pay the cold-start costs at process start instead of on the first
+    voice turn: DNS + TCP + TLS towards the agent endpoint, and the first
+    embedding/vector-search call in the retrieval stack.
+    """
+    try:
+        headers = {}
+        if settings.DEEPGRAM_API_KEY:
+            headers["Authorization"] = f"Token {settings.DEEPGRAM_API_KEY}"
+        ws = await asyncio.wait_for(
+            websockets.connect(VOICE_AGENT_URL, additional_headers=headers, ssl=_SSL_CONTEXT),
+            timeout=5
+        )
+        await ws.close()
+        logger.info("[VOICE_WARMUP] Agent connection path warmed")
+    except Exception as e:
+        logger.warning(f"[VOICE_WARMUP] Agent connection warmup skipped: {e}")
+
+    try:
+        await asyncio.to_thread(
+            retrieve_documents,
+            query="warmup",
+            collection_name=DEFAULT_COLLECTION,
+            top_k=1
+        )
+        logger.info("[VOICE_WARMUP] Retrieval stack warmed")
+    except Exception as e:
+        logger.warning(f"[VOICE_WARMUP] Retrieval warmup skipped: {e}")
+
 
 class VoiceAgentSession:
     """Manages a session with Deepgram Voice Agent API."""
-    
+
+    # Slotted: saves the per-instance __dict__ at scale and gives fixed-slot
+    # access on the attributes touched per audio chunk
+    __slots__ = (
+        "__weakref__",  # sessions are tracked in a WeakValueDictionary
+        "session_id", "_log_prefix", "client_ws", "settings", "agent_ws",
+        "is_active", "start_time", "audio_chunk_count", "playback_started_sent",
+        "dropped_chunk_count", "_send_buf", "_flush_handle", "_pending_audio",
+        "_client_flush_handle", "_fn_table", "_handlers",
+        "_audio_q", "_event_q",
+    )
+
+    # One-time control message describing the raw binary audio stream - the
+    # client treats subsequent binary frames as PCM16 chunks
+    _AUDIO_STREAM_META = '{"type":"audio_stream_meta","encoding":"linear16","sample_rate":24000}'
+
+    # Prebuilt payload templates for function-call turns - cloned with .copy()
+    # instead of re-allocating the key strings on every tool-call burst
+    _FN_RESPONSE_TEMPLATE = {"type": "FunctionCallResponse", "id": "", "name": "", "content": ""}
+    _FN_EXECUTED_TEMPLATE = {"type": "function_executed", "name": "", "result": ""}
+
     def __init__(self, session_id: str, client_ws: WebSocket, settings: Settings):
         self.session_id = session_id
+        # Precomputed once - every log line re-used to rebuild this f-string
+        self._log_prefix = f"[{session_id}]"
         self.client_ws = client_ws
         self.settings = settings
         self.agent_ws: Optional[websockets.WebSocketClientProtocol] = None
@@ -35,87 +155,209 @@ class VoiceAgentSession:
         self.start_time: Optional[float] = None
         self.audio_chunk_count = 0
         self.playback_started_sent = False
+        self.dropped_chunk_count = 0
+        self._send_buf = bytearray()
+        self._flush_handle = None
+        self._pending_audio = bytearray()
+        self._client_flush_handle = None
+        # Decouple the recv loop from message handling: audio drains on its
+        # own fast path and never waits behind a slow function-call handler
+        self._audio_q: asyncio.Queue = asyncio.Queue(maxsize=64)
+        self._event_q: asyncio.Queue = asyncio.Queue(maxsize=256)
+        # O(1) dispatch for function execution instead of string elif chains
+        self._fn_table = {
+            "get_current_weather": self._fn_weather,
+            "search_articles": self._fn_search,
+            "retrieve_documents": self._fn_retrieve,
+        }
+        # O(1) dispatch for agent messages instead of a per-message elif chain
+        self._handlers = {
+            "Welcome": self._on_welcome,
+            "SettingsApplied": self._on_settings_applied,
+            "UserStartedSpeaking": self._on_user_started_speaking,
+            "AgentThinking": self._on_agent_thinking,
+            "AgentStartedSpeaking": self._on_agent_started_speaking,
+            "AgentAudioDone": self._on_agent_audio_done,
+            "ConversationText": self._on_conversation_text,
+            "FunctionCallRequest": self._on_function_call_request,
+            "FunctionCall": self._on_function_call,
+            "FunctionCallResult": self._on_function_call_result,
+            "Error": self._on_error,
+        }
     
     async def connect_to_agent(self) -> bool:
         """Connect to Deepgram Voice Agent API."""
         try:
             deepgram_api_key = self.settings.DEEPGRAM_API_KEY
             if not deepgram_api_key:
-                logger.error(f"[{self.session_id}] DEEPGRAM_API_KEY not configured")
+                logger.error(f"{self._log_prefix} DEEPGRAM_API_KEY not configured")
                 return False
             
-            # Connect without ping timeout settings
+            # PCM16 audio is effectively incompressible, so permessage-deflate
+            # only burns CPU per frame - disable it. Raised size/buffer limits
+            # avoid backpressure stalls on large audio bursts.
             self.agent_ws = await websockets.connect(
                 VOICE_AGENT_URL,
-                additional_headers={"Authorization": f"Token {deepgram_api_key}"}
+                additional_headers={"Authorization": f"Token {deepgram_api_key}"},
+                ssl=_SSL_CONTEXT,
+                compression=None,
+                max_size=2**24,
+                write_limit=2**20,
+                ping_interval=20,
+                ping_timeout=20
             )
-            logger.info(f"[{self.session_id}] Connected to Deepgram Voice Agent")
+            logger.info(f"{self._log_prefix} Connected to Deepgram Voice Agent")
             
-            # Send Settings message to configure the agent
-            settings_dict = await get_voice_agent_settings(self.settings)
-            await self.agent_ws.send(json.dumps(settings_dict))
-            logger.info(f"[{self.session_id}] Sent Settings to Voice Agent")
+            # Send Settings message to configure the agent (cached JSON string)
+            settings_json = await get_voice_agent_settings_json(self.settings)
+            await self.agent_ws.send(settings_json)
+            logger.info(f"{self._log_prefix} Sent Settings to Voice Agent")
             
             return True
         except Exception as e:
-            logger.error(f"[{self.session_id}] Failed to connect to Voice Agent: {e}")
+            logger.error(f"{self._log_prefix} Failed to connect to Voice Agent: {e}")
             return False
 
     
     async def forward_audio_to_agent(self, audio_data: bytes):
         """Forward audio from client to Deepgram Voice Agent."""
+        if not self.agent_ws:
+            return
+        if AUDIO_BATCH_WINDOW <= 0:
+            await self._send_audio_to_agent(audio_data)
+            return
+        # Batch ~20ms PCM chunks into one frame per window instead of one
+        # frame-encode + TCP write per chunk
+        self._send_buf += audio_data
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(
+                AUDIO_BATCH_WINDOW,
+                lambda: asyncio.ensure_future(self._flush_audio_buffer())
+            )
+
+    async def _flush_audio_buffer(self):
+        """Send all audio coalesced during the batching window as one frame."""
+        self._flush_handle = None
+        if not self._send_buf:
+            return
+        audio_data = bytes(self._send_buf)
+        self._send_buf.clear()
         if self.agent_ws:
-            try:
-                await self.agent_ws.send(audio_data)
-            except Exception as e:
-                logger.error(f"[{self.session_id}] Error sending audio to agent: {e}")
+            await self._send_audio_to_agent(audio_data)
+
+    async def _send_audio_to_agent(self, audio_data: bytes):
+        try:
+            # Backpressure gate: if the agent socket isn't draining, drop
+            # the chunk rather than queueing unbounded audio in memory
+            transport = getattr(self.agent_ws, "transport", None)
+            if transport is not None and transport.get_write_buffer_size() > SEND_HIGH_WATERMARK:
+                self.dropped_chunk_count += 1
+                if self.dropped_chunk_count % 50 == 1:
+                    logger.warning(f"{self._log_prefix} Agent socket backed up, dropping audio (dropped: {self.dropped_chunk_count})")
+                return
+            await self.agent_ws.send(audio_data)
+        except Exception as e:
+            logger.error(f"{self._log_prefix} Error sending audio to agent: {e}")
     
     async def receive_from_agent(self):
-        """Receive messages/audio from Deepgram Voice Agent and forward to client."""
+        """Receive messages/audio from Deepgram Voice Agent and forward to client.
+
+        The recv loop only classifies frames and enqueues them; dedicated
+        pumps drain audio (fast path) and JSON events (which may block on
+        tool calls) independently.
+        """
+        audio_pump = asyncio.create_task(self._audio_pump())
+        event_pump = asyncio.create_task(self._event_pump())
         try:
             while self.is_active and self.agent_ws:
                 try:
-                    msg = await asyncio.wait_for(self.agent_ws.recv(), timeout=0.1)
-                    
-                    if isinstance(msg, bytes):
-                        # Audio data from TTS - forward to client
-                        self.audio_chunk_count += 1
-                        
-                        # Send playback_started on first audio chunk
-                        if not self.playback_started_sent:
-                            self.playback_started_sent = True
-                            if self.start_time:
-                                latency_ms = int((time.perf_counter() - self.start_time) * 1000)
-                                logger.info(f"[{self.session_id}] Agent | ⚡ First audio (latency: {latency_ms}ms)")
-                            await self.client_ws.send_text(json.dumps({
-                                "type": "playback_started"
-                            }))
-                        
-                        # Log only first audio chunk
-                        if self.audio_chunk_count == 1:
-                            logger.info(f"[{self.session_id}] Agent | Receiving audio chunks...")
-                        
-                        audio_base64 = base64.b64encode(msg).decode('utf-8')
-                        await self.client_ws.send_text(json.dumps({
-                            "type": "audio_chunk",
-                            "audio": audio_base64,
-                            "encoding": "linear16",
-                            "sample_rate": 24000
-                        }))
-                        
-                    elif isinstance(msg, str):
-                        # JSON message from agent
-                        await self._handle_agent_message(msg)
-                            
-                except asyncio.TimeoutError:
-                    continue
+                    # Pure awaitable read - no 10x/sec timeout wakeups and no
+                    # up-to-100ms quantization on first-audio latency. close()
+                    # closes the socket, which unblocks recv with
+                    # ConnectionClosed and exits the loop.
+                    msg = await self.agent_ws.recv()
                 except websockets.exceptions.ConnectionClosed:
-                    logger.info(f"[{self.session_id}] Agent connection closed")
+                    logger.info(f"{self._log_prefix} Agent connection closed")
                     break
-                    
+
+                # recv() returns exactly bytes or str, so an exact type
+                # check beats isinstance's MRO walk on this hot dispatch
+                if type(msg) is bytes:
+                    try:
+                        self._audio_q.put_nowait(msg)
+                    except asyncio.QueueFull:
+                        # Client can't keep up - drop rather than buffer
+                        self.dropped_chunk_count += 1
+                else:
+                    await self._event_q.put(msg)
+
         except Exception as e:
-            logger.error(f"[{self.session_id}] Error receiving from agent: {e}")
+            logger.error(f"{self._log_prefix} Error receiving from agent: {e}")
+        finally:
+            audio_pump.cancel()
+            event_pump.cancel()
+
+    async def _audio_pump(self):
+        """Drain TTS audio from the agent and forward it to the client."""
+        while True:
+            msg = await self._audio_q.get()
+            try:
+                self.audio_chunk_count += 1
+
+                # Send playback_started on first audio chunk
+                if not self.playback_started_sent:
+                    self.playback_started_sent = True
+                    if self.start_time:
+                        latency_ms = int((time.perf_counter() - self.start_time) * 1000)
+                        logger.info(f"{self._log_prefix} Agent | ⚡ First audio (latency: {latency_ms}ms)")
+                    await self.client_ws.send_text(_PLAYBACK_STARTED)
+
+                # Log only first audio chunk
+                if self.audio_chunk_count == 1:
+                    logger.info(f"{self._log_prefix} Agent | Receiving audio chunks...")
+                    await self.client_ws.send_text(self._AUDIO_STREAM_META)
+
+                # Forward raw PCM16 as a binary frame - no base64
+                # inflation and no JSON envelope per chunk
+                await self._forward_audio_to_client(msg)
+            except Exception as e:
+                logger.error(f"{self._log_prefix} Error forwarding audio to client: {e}")
+
+    async def _event_pump(self):
+        """Drain JSON agent events, including slow function-call handling."""
+        while True:
+            msg = await self._event_q.get()
+            try:
+                await self._handle_agent_message(msg)
+            except Exception as e:
+                logger.error(f"{self._log_prefix} Error handling agent message: {e}")
     
+    async def _forward_audio_to_client(self, audio_data: bytes):
+        """Forward TTS audio to the client, coalescing chunks per window."""
+        if CLIENT_AUDIO_BATCH_WINDOW <= 0:
+            await self.client_ws.send_bytes(audio_data)
+            return
+        self._pending_audio += audio_data
+        if self._client_flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._client_flush_handle = loop.call_later(
+                CLIENT_AUDIO_BATCH_WINDOW,
+                lambda: asyncio.ensure_future(self._flush_client_audio())
+            )
+
+    async def _flush_client_audio(self):
+        """Send all TTS audio coalesced during the window as one frame."""
+        self._client_flush_handle = None
+        if not self._pending_audio:
+            return
+        audio_data = bytes(self._pending_audio)
+        self._pending_audio.clear()
+        try:
+            await self.client_ws.send_bytes(audio_data)
+        except Exception as e:
+            logger.error(f"{self._log_prefix} Error sending audio to client: {e}")
+
     async def _execute_function(self, function_name: str, arguments: dict) -> str:
         """
         Execute a function and return the result as a JSON string.
@@ -123,235 +365,260 @@ class VoiceAgentSession:
         """
         start_time = time.perf_counter()
         
-        logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Starting execution: {function_name}")
-        logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Arguments: {json.dumps(arguments)}")
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Starting execution: {function_name}")
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Arguments: {orjson.dumps(arguments).decode()}")
         
         try:
-            if function_name == "get_current_weather":
-                location = arguments.get("location", "")
-                unit = arguments.get("unit", "celsius")
-                
-                logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Weather lookup: location={location}, unit={unit}")
-                
-                result = get_current_weather(location=location, unit=unit)
-                
-                elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-                logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Weather result: {result.get('description', 'N/A')}, temp={result.get('temperature', 'N/A')}° | took {elapsed_ms}ms")
-                return json.dumps(result)
-            
-            elif function_name == "search_articles":
-                query = arguments.get("query", "")
-                max_results = arguments.get("max_results", 2)
-                
-                logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Web search: query='{query}', max_results={max_results}")
-                
-                result = search_articles(query=query, max_results=max_results)
-                
-                elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-                content_preview = str(result)[:150] if result else "No results"
-                logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Search result: {content_preview}... | took {elapsed_ms}ms")
-                return json.dumps(result)
-            
-            elif function_name == "retrieve_documents":
-                query = arguments.get("query", "")
-                file_ids = arguments.get("file_ids", None)
-                
-                logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Document retrieval: query='{query}', collection={DEFAULT_COLLECTION}")
-                
-                # Use retrieve_documents from tools/functions.py
-                documents, token_usage = retrieve_documents(
-                    query=query,
-                    collection_name=DEFAULT_COLLECTION,
-                    file_ids=file_ids,
-                    top_k=5  # Fewer docs for voice to keep response concise
-                )
-                
-                elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-                logger.info(f"[VOICE_FUNCTION] [{self.session_id}] Retrieved {len(documents)} documents | tokens={token_usage} | took {elapsed_ms}ms")
-                
-                if documents:
-                    # Format documents for voice response
-                    doc_summaries = []
-                    for i, doc in enumerate(documents[:3]):  # Top 3 for voice
-                        content_preview = doc.page_content[:200].replace('\n', ' ')
-                        doc_summaries.append({
-                            "index": i + 1,
-                            "file": doc.metadata.get("file_name", "Unknown"),
-                            "content": content_preview,
-                            "score": round(doc.metadata.get("score", 0), 3)
-                        })
-                        logger.debug(f"[VOICE_FUNCTION] [{self.session_id}] Doc {i+1}: {doc.metadata.get('file_name', 'Unknown')} (score={doc.metadata.get('score', 0):.3f})")
-                    
-                    result = {
-                        "found": True,
-                        "count": len(documents),
-                        "documents": doc_summaries,
-                        "message": f"Found {len(documents)} relevant documents"
-                    }
-                else:
-                    result = {
-                        "found": False,
-                        "count": 0,
-                        "message": "No relevant documents found for this query"
-                    }
-                
-                return json.dumps(result)
-            
-            else:
-                logger.warning(f"[VOICE_FUNCTION] [{self.session_id}] Unknown function: {function_name}")
-                return json.dumps({"error": f"Unknown function: {function_name}"})
-                
+            handler = self._fn_table.get(function_name)
+            if handler is None:
+                logger.warning(f"[VOICE_FUNCTION] {self._log_prefix} Unknown function: {function_name}")
+                return orjson_dumps_str({"error": f"Unknown function: {function_name}"})
+            return await handler(arguments, start_time)
+
         except Exception as e:
             elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-            logger.error(f"[VOICE_FUNCTION] [{self.session_id}] Error in {function_name} after {elapsed_ms}ms: {e}")
-            traceback.print_exc()
-            return json.dumps({"error": str(e)})
-    
+            logger.exception(f"[VOICE_FUNCTION] {self._log_prefix} Error in {function_name} after {elapsed_ms}ms: {e}")
+            return orjson_dumps_str({"error": str(e)})
+
+    async def _fn_weather(self, arguments: dict, start_time: float) -> str:
+        location = arguments.get("location", "")
+        unit = arguments.get("unit", "celsius")
+
+        cache_key = ("weather", location.lower().strip(), unit)
+        cached = _tool_cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Weather cache hit: location={location}")
+            return cached
+
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Weather lookup: location={location}, unit={unit}")
+
+        # Sync HTTP call - run in a thread so the event loop
+        # (and every other session's audio) isn't stalled behind it
+        result = await asyncio.to_thread(get_current_weather, location=location, unit=unit)
+
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Weather result: {result.get('description', 'N/A')}, temp={result.get('temperature', 'N/A')}° | took {elapsed_ms}ms")
+        result_json = orjson_dumps_str(result)
+        _tool_cache_put(cache_key, result_json)
+        return result_json
+
+    async def _fn_search(self, arguments: dict, start_time: float) -> str:
+        query = arguments.get("query", "")
+        max_results = arguments.get("max_results", 2)
+
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Web search: query='{query}', max_results={max_results}")
+
+        result = await asyncio.to_thread(search_articles, query=query, max_results=max_results)
+
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        content_preview = str(result)[:150] if result else "No results"
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Search result: {content_preview}... | took {elapsed_ms}ms")
+        return orjson_dumps_str(result)
+
+    async def _fn_retrieve(self, arguments: dict, start_time: float) -> str:
+        query = arguments.get("query", "")
+        file_ids = arguments.get("file_ids", None)
+
+        cache_key = ("retrieve", query.lower().strip(), tuple(sorted(file_ids or ())))
+        cached = _tool_cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Retrieval cache hit: query='{query}'")
+            return cached
+
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Document retrieval: query='{query}', collection={DEFAULT_COLLECTION}")
+
+        # Use retrieve_documents from tools/functions.py - it does blocking
+        # Milvus and embedding I/O, so keep it off the event loop
+        documents, token_usage = await asyncio.to_thread(
+            retrieve_documents,
+            query=query,
+            collection_name=DEFAULT_COLLECTION,
+            file_ids=file_ids,
+            top_k=5,  # Fewer docs for voice to keep response concise
+            # Voice summaries only read file_name/score - skip file_path
+            output_fields=("text", "file_id", "file_name", "page_number", "chunk_number")
+        )
+
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        logger.info(f"[VOICE_FUNCTION] {self._log_prefix} Retrieved {len(documents)} documents | tokens={token_usage} | took {elapsed_ms}ms")
+
+        if documents:
+            # Format documents for voice response
+            doc_summaries = []
+            for i, doc in enumerate(documents[:3]):  # Top 3 for voice
+                content_preview = doc.page_content[:200].replace('\n', ' ')
+                doc_summaries.append({
+                    "index": i + 1,
+                    "file": doc.metadata.get("file_name", "Unknown"),
+                    "content": content_preview,
+                    "score": round(doc.metadata.get("score", 0), 3)
+                })
+                if _debug_enabled():
+                    logger.debug(f"[VOICE_FUNCTION] {self._log_prefix} Doc {i+1}: {doc.metadata.get('file_name', 'Unknown')} (score={doc.metadata.get('score', 0):.3f})")
+
+            result = {
+                "found": True,
+                "count": len(documents),
+                "documents": doc_summaries,
+                "message": f"Found {len(documents)} relevant documents"
+            }
+        else:
+            result = {
+                "found": False,
+                "count": 0,
+                "message": "No relevant documents found for this query"
+            }
+
+        result_json = orjson_dumps_str(result)
+        _tool_cache_put(cache_key, result_json)
+        return result_json
+
     async def _handle_agent_message(self, msg: str):
         """Handle JSON message from Deepgram Voice Agent."""
-        data = json.loads(msg)
+        data = orjson.loads(msg)
         msg_type = data.get("type")
-        
-        if msg_type == "Welcome":
-            logger.info(f"[{self.session_id}] Agent | Welcome received")
-            await self.client_ws.send_text(json.dumps({
-                "type": "agent_ready"
-            }))
-            
-        elif msg_type == "SettingsApplied":
-            logger.info(f"[{self.session_id}] Agent | Settings applied")
-            await self.client_ws.send_text(json.dumps({
-                "type": "settings_applied"
-            }))
-            
-        elif msg_type == "UserStartedSpeaking":
-            self.start_time = time.perf_counter()
-            logger.info(f"[{self.session_id}] Agent | User started speaking")
-            await self.client_ws.send_text(json.dumps({
-                "type": "speech_started"
-            }))
-            
-        elif msg_type == "AgentThinking":
-            logger.info(f"[{self.session_id}] Agent | Thinking...")
-            await self.client_ws.send_text(json.dumps({
-                "type": "thinking"
-            }))
-            
-        elif msg_type == "AgentStartedSpeaking":
-            if self.start_time:
-                latency_ms = int((time.perf_counter() - self.start_time) * 1000)
-                logger.info(f"[{self.session_id}] Agent | ⚡ Started speaking (latency: {latency_ms}ms)")
-            await self.client_ws.send_text(json.dumps({
-                "type": "playback_started"
-            }))
-            
-        elif msg_type == "AgentAudioDone":
-            logger.info(f"[{self.session_id}] Agent | Audio done (total chunks: {self.audio_chunk_count})")
-            # Reset for next response
-            self.audio_chunk_count = 0
-            self.playback_started_sent = False
-            await self.client_ws.send_text(json.dumps({
-                "type": "playback_finished"
-            }))
-            
-        elif msg_type == "ConversationText":
-            # Transcript or response text
-            role = data.get("role")
-            content = data.get("content", "")
-            
-            if role == "user":
-                logger.info(f"[{self.session_id}] Agent | User: {content}")
-                await self.client_ws.send_text(json.dumps({
-                    "type": "transcript",
-                    "text": content
-                }))
-            elif role == "assistant":
-                logger.info(f"[{self.session_id}] Agent | Assistant: {content}")
-                await self.client_ws.send_text(json.dumps({
-                    "type": "response",
-                    "text": content
-                }))
-        
-        elif msg_type == "FunctionCallRequest":
-            # Deepgram is requesting us to execute a function
-            # This happens when client_side: true
-            functions = data.get("functions", [])
-            logger.info(f"[{self.session_id}] Agent | FunctionCallRequest: {data}")
-            
-            for func in functions:
-                func_id = func.get("id", "")
-                func_name = func.get("name", "")
-                func_args_str = func.get("arguments", "{}")
-                
-                # Parse arguments
-                try:
-                    func_args = json.loads(func_args_str) if isinstance(func_args_str, str) else func_args_str
-                except json.JSONDecodeError:
-                    func_args = {}
-                
-                logger.info(f"[{self.session_id}] Agent | Executing: {func_name}({func_args})")
-                
-                # Execute the function
-                result = await self._execute_function(func_name, func_args)
-                
-                logger.info(f"[{self.session_id}] Agent | Function result: {result}")
-                
-                # Send FunctionCallResponse back to Deepgram
-                response = {
-                    "type": "FunctionCallResponse",
-                    "id": func_id,
-                    "name": func_name,
-                    "content": result
-                }
-                
-                await self.agent_ws.send(json.dumps(response))
-                logger.info(f"[{self.session_id}] Agent | Sent FunctionCallResponse for {func_name}")
-                
-                # Notify client
-                await self.client_ws.send_text(json.dumps({
-                    "type": "function_executed",
-                    "name": func_name,
-                    "result": result
-                }))
-                
-        elif msg_type == "FunctionCall":
-            # Legacy handler - tool/function call from agent (server-side)
-            function_name = data.get("name", "")
-            function_args = data.get("arguments", {})
-            logger.info(f"[{self.session_id}] Agent | Function call: {function_name}({function_args})")
-            await self.client_ws.send_text(json.dumps({
-                "type": "function_call",
-                "name": function_name,
-                "arguments": function_args
-            }))
-            
-        elif msg_type == "FunctionCallResult":
-            # Result of function call
-            result = data.get("result", "")
-            logger.info(f"[{self.session_id}] Agent | Function result received")
-            await self.client_ws.send_text(json.dumps({
-                "type": "function_result",
-                "result": result
+
+        handler = self._handlers.get(msg_type)
+        if handler is not None:
+            await handler(data)
+        else:
+            if _debug_enabled():
+                logger.debug(f"{self._log_prefix} Agent | {msg_type}: {data}")
+
+    async def _on_welcome(self, data: dict):
+        logger.info(f"{self._log_prefix} Agent | Welcome received")
+        await self.client_ws.send_text(_AGENT_READY)
+
+    async def _on_settings_applied(self, data: dict):
+        logger.info(f"{self._log_prefix} Agent | Settings applied")
+        await self.client_ws.send_text(_SETTINGS_APPLIED)
+
+    async def _on_user_started_speaking(self, data: dict):
+        self.start_time = time.perf_counter()
+        logger.info(f"{self._log_prefix} Agent | User started speaking")
+        await self.client_ws.send_text(_SPEECH_STARTED)
+
+    async def _on_agent_thinking(self, data: dict):
+        logger.info(f"{self._log_prefix} Agent | Thinking...")
+        await self.client_ws.send_text(_THINKING)
+
+    async def _on_agent_started_speaking(self, data: dict):
+        # playback_started is emitted from the first-audio-chunk branch in
+        # receive_from_agent (where latency is measured) - don't double-send
+        if self.start_time:
+            latency_ms = int((time.perf_counter() - self.start_time) * 1000)
+            logger.info(f"{self._log_prefix} Agent | ⚡ Started speaking (latency: {latency_ms}ms)")
+
+    async def _on_agent_audio_done(self, data: dict):
+        logger.info(f"{self._log_prefix} Agent | Audio done (total chunks: {self.audio_chunk_count})")
+        # Reset for next response
+        self.audio_chunk_count = 0
+        self.playback_started_sent = False
+        await self.client_ws.send_text(_PLAYBACK_FINISHED)
+
+    async def _on_conversation_text(self, data: dict):
+        # Transcript or response text
+        role = data.get("role")
+        content = data.get("content", "")
+
+        if role == "user":
+            logger.info(f"{self._log_prefix} Agent | User: {content}")
+            await self.client_ws.send_text(orjson_dumps_str({
+                "type": "transcript",
+                "text": content
             }))
-                
-        elif msg_type == "Error":
-            error_msg = data.get("message", "Unknown error")
-            logger.error(f"[{self.session_id}] Agent | Error: {error_msg}")
-            await self.client_ws.send_text(json.dumps({
-                "type": "error",
-                "message": error_msg
+        elif role == "assistant":
+            logger.info(f"{self._log_prefix} Agent | Assistant: {content}")
+            await self.client_ws.send_text(orjson_dumps_str({
+                "type": "response",
+                "text": content
             }))
-            
-        else:
-            logger.debug(f"[{self.session_id}] Agent | {msg_type}: {data}")
+
+    async def _on_function_call_request(self, data: dict):
+        # Deepgram is requesting us to execute a function
+        # This happens when client_side: true
+        functions = data.get("functions", [])
+        logger.info(f"{self._log_prefix} Agent | FunctionCallRequest: {data}")
+
+        for func in functions:
+            func_id = func.get("id", "")
+            func_name = func.get("name", "")
+            func_args_str = func.get("arguments", "{}")
+
+            # Deepgram consistently sends arguments as a JSON string - parse
+            # directly and fall back to empty args on anything malformed
+            try:
+                func_args = orjson.loads(func_args_str)
+            except Exception:
+                func_args = {}
+
+            logger.info(f"{self._log_prefix} Agent | Executing: {func_name}({func_args})")
+
+            # Execute the function
+            result = await self._execute_function(func_name, func_args)
+
+            logger.info(f"{self._log_prefix} Agent | Function result: {result}")
+
+            # Send FunctionCallResponse back to Deepgram
+            response = self._FN_RESPONSE_TEMPLATE.copy()
+            response["id"] = func_id
+            response["name"] = func_name
+            response["content"] = result
+
+            # Notify client
+            notification = self._FN_EXECUTED_TEMPLATE.copy()
+            notification["name"] = func_name
+            notification["result"] = result
+
+            # Both sends are independent - issue them concurrently instead
+            # of paying two sequential event-loop round trips
+            await asyncio.gather(
+                self.agent_ws.send(orjson.dumps(response).decode()),
+                self.client_ws.send_text(orjson.dumps(notification).decode())
+            )
+            logger.info(f"{self._log_prefix} Agent | Sent FunctionCallResponse for {func_name}")
+
+    async def _on_function_call(self, data: dict):
+        # Legacy handler - tool/function call from agent (server-side)
+        function_name = data.get("name", "")
+        function_args = data.get("arguments", {})
+        logger.info(f"{self._log_prefix} Agent | Function call: {function_name}({function_args})")
+        await self.client_ws.send_text(orjson_dumps_str({
+            "type": "function_call",
+            "name": function_name,
+            "arguments": function_args
+        }))
+
+    async def _on_function_call_result(self, data: dict):
+        # Result of function call
+        result = data.get("result", "")
+        logger.info(f"{self._log_prefix} Agent | Function result received")
+        await self.client_ws.send_text(orjson_dumps_str({
+            "type": "function_result",
+            "result": result
+        }))
+
+    async def _on_error(self, data: dict):
+        error_msg = data.get("message", "Unknown error")
+        logger.error(f"{self._log_prefix} Agent | Error: {error_msg}")
+        await self.client_ws.send_text(orjson_dumps_str({
+            "type": "error",
+            "message": error_msg
+        }))
     
     async def close(self):
         """Close the Voice Agent connection."""
         self.is_active = False
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._client_flush_handle is not None:
+            self._client_flush_handle.cancel()
+            self._client_flush_handle = None
         if self.agent_ws:
             try:
                 await self.agent_ws.close()
             except Exception:
                 pass
-        logger.info(f"[{self.session_id}] Session closed")
+        logger.info(f"{self._log_prefix} Session closed")
 
@@ -2,10 +2,10 @@
 Voice Agent WebSocket Controller.
 Handles WebSocket connections for real-time voice interactions.
 """
-import json
-import base64
 import asyncio
-from typing import Dict
+import weakref
+from binascii import a2b_base64
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from loguru import logger
 from app.config import settings
@@ -14,8 +14,14 @@ from app.api.voice.services.voice_session import VoiceAgentSession
 
 router = APIRouter()
 
-# Store active sessions
-active_sessions: Dict[str, VoiceAgentSession] = {}
+# Pre-encoded control messages - serialized once at import. session_started
+# interpolates the session_id JSON-escaped (path params can carry quotes).
+_ERR_CONNECT = '{"type":"error","message":"Failed to connect to voice agent"}'
+_SESSION_STARTED_TEMPLATE = '{"type":"session_started","session_id":%s}'
+
+# Store active sessions - weak values so sessions that die on abnormal
+# exits vanish instead of leaking in the dict
+active_sessions: "weakref.WeakValueDictionary[str, VoiceAgentSession]" = weakref.WeakValueDictionary()
 
 
 @router.websocket("/ws/voice/{session_id}")
@@ -29,7 +35,9 @@ async def websocket_voice_endpoint(
     
     Message Types (Client -> Server):
     - start_session: Initialize voice agent connection
-    - audio_chunk: Forward audio data (base64 encoded in audio_data field)
+    - binary frames: Raw PCM16 audio, forwarded directly (preferred)
+    - audio_chunk: Forward audio data (base64 encoded in audio_data field,
+      legacy fallback for clients that cannot send binary frames)
     - end_session: Close the session
     
     Message Types (Server -> Client):
@@ -40,7 +48,8 @@ async def websocket_voice_endpoint(
     - thinking: Agent is processing
     - playback_started: Audio playback beginning
     - playback_finished: Audio playback complete
-    - audio_chunk: Audio data from TTS (base64 encoded)
+    - audio_stream_meta: Encoding/sample-rate of the binary audio stream
+    - binary frames: Raw PCM16 audio data from TTS
     - transcript: User speech transcript
     - response: Agent text response
     - function_call: Agent called a function/tool
@@ -49,62 +58,65 @@ async def websocket_voice_endpoint(
     """
     await websocket.accept()
     logger.info(f"[{session_id}] Client connected")
-    
-    session = VoiceAgentSession(session_id, websocket, settings)
-    active_sessions[session_id] = session
-    
+
+    # Created lazily on start_session - probe/scanner connections that never
+    # start a session shouldn't pay ctor work or churn active_sessions
+    session: VoiceAgentSession | None = None
+
     try:
         while True:
             message = await websocket.receive()
-            
-            if message.get("type") == "websocket.disconnect":
+
+            if message["type"] == "websocket.disconnect":
                 break
-                
-            if "text" in message:
-                data = json.loads(message["text"])
+
+            # Hot path first: raw binary audio, forwarded without touching
+            # the JSON dispatch below (~50 chunks/sec/session)
+            audio_bytes = message.get("bytes")
+            if audio_bytes is not None:
+                if session is not None:
+                    await session.forward_audio_to_agent(audio_bytes)
+                continue
+
+            text = message.get("text")
+            if text is not None:
+                data = orjson.loads(text)
                 msg_type = data.get("type")
                 
                 if msg_type == "start_session":
                     logger.info(f"[{session_id}] Starting voice agent session...")
+                    if session is None:
+                        session = VoiceAgentSession(session_id, websocket, settings)
+                        active_sessions[session_id] = session
                     success = await session.connect_to_agent()
                     
                     if success:
                         # Start receiving from agent in background
                         asyncio.create_task(session.receive_from_agent())
-                        await session.client_ws.send_text(json.dumps({
-                            "type": "session_started",
-                            "session_id": session_id
-                        }))
+                        await websocket.send_text(_SESSION_STARTED_TEMPLATE % orjson.dumps(session_id).decode())
                     else:
-                        await session.client_ws.send_text(json.dumps({
-                            "type": "error",
-                            "message": "Failed to connect to voice agent"
-                        }))
-                
+                        await websocket.send_text(_ERR_CONNECT)
+
                 elif msg_type == "audio_chunk":
-                    # Decode and forward audio to Deepgram Voice Agent
-                    if "audio_data" in data:
-                        audio_bytes = base64.b64decode(data["audio_data"])
-                        await session.forward_audio_to_agent(audio_bytes)
+                    # Deprecated: audio should arrive as binary frames. For
+                    # legacy clients, a2b_base64 is the C fast path without
+                    # b64decode's validation wrapper.
+                    if session is not None and "audio_data" in data:
+                        await session.forward_audio_to_agent(a2b_base64(data["audio_data"]))
                 
                 elif msg_type == "end_session":
                     logger.info(f"[{session_id}] Ending session...")
                     break
-            
-            elif "bytes" in message:
-                # Raw binary audio - forward directly
-                await session.forward_audio_to_agent(message["bytes"])
-    
+
     except WebSocketDisconnect:
         logger.info(f"[{session_id}] Client disconnected")
     except Exception as e:
-        logger.error(f"[{session_id}] WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
+        # loguru renders the traceback lazily in the sink, off the event loop
+        logger.exception(f"[{session_id}] WebSocket error: {e}")
     finally:
-        await session.close()
-        if session_id in active_sessions:
-            del active_sessions[session_id]
+        if session is not None:
+            await session.close()
+            active_sessions.pop(session_id, None)
 
 
 async def get_active_session(session_id: str) -> VoiceAgentSession | None:
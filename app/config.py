@@ -1,4 +1,4 @@
-from functools import lru_cache
+from functools import cache
 from pydantic_settings import BaseSettings
 import logging
 import os
@@ -23,6 +23,7 @@ class Settings(BaseSettings):
 
     # CORS configuration
     CORS_ORIGINS: str = ""  # Empty by default, set to comma-separated list of domains or "*" for all
+    CORS_ORIGIN_LIST: list = []  # Computed once in get_settings - consumers never re-split
     CORS_METHODS: list = ["*"]
     CORS_HEADERS: list = ["*"]
 
@@ -58,7 +59,8 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-@lru_cache()
+# functools.cache skips lru_cache's bookkeeping for this zero-arg singleton
+@cache
 def get_settings():
     """
     Function to load settings from the `.env` file.
@@ -74,11 +76,12 @@ def get_settings():
             # Remove quotes if present
             cors_str = settings.CORS_ORIGINS.strip('"').strip("'")
             if cors_str == "*":
-                settings.CORS_ORIGINS = "[]"  # Disallow "*" in production for security
+                settings.CORS_ORIGIN_LIST = []  # Disallow "*" in production for security
             else:
-                settings.CORS_ORIGINS = ",".join([origin.strip() for origin in cors_str.split(",") if origin.strip()])
+                settings.CORS_ORIGIN_LIST = [origin.strip() for origin in cors_str.split(",") if origin.strip()]
         else:
-            settings.CORS_ORIGINS = ""  # No CORS origins allowed if not specified
+            settings.CORS_ORIGIN_LIST = []  # No CORS origins allowed if not specified
+        settings.CORS_ORIGINS = ",".join(settings.CORS_ORIGIN_LIST)
         settings.CORS_HEADERS = [
             "Authorization",  # For JWT tokens
             "Content-Type",   # For application/json and other content types
@@ -90,6 +93,7 @@ def get_settings():
         settings.DEBUG = True
         settings.LOG_LEVEL = "DEBUG"
         settings.CORS_ORIGINS = "*"  # Allow all origins for development
+        settings.CORS_ORIGIN_LIST = ["*"]
     
     return settings
 
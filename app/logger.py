@@ -13,7 +13,8 @@ def setup_logger(settings):
     logger.add(
         sys.stdout,  # Log to console
         format="{level} | {file} | {line} | {message}",
-        level=settings.LOG_LEVEL
+        level=settings.LOG_LEVEL,
+        enqueue=True,  # Format/write in a background thread, off the event loop
     )
 
     logger.add(
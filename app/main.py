@@ -6,41 +6,68 @@ from app.config import settings
 from app.middleware import setup_middlewares
 from app.route import setup_routes
 from app.logger import setup_logger
-from app.RAG.vector_store import (
-    connect_to_milvus, load_all_milvus_collections,
-    unload_all_milvus_collections, disconnect_from_milvus,
-)
-import asyncio, os, socket
-from filelock import FileLock, Timeout
+import asyncio, fcntl, os, socket
 
 LOCK_FILE = os.path.join(tempfile.gettempdir(), "rag_worker.lock")
 
+# Held open for the process lifetime - the kernel drops the flock when the
+# process dies, so a crashed primary never leaves a stale lock behind
+_lock_fd = None
+
+
+def _try_acquire_primary_lock(hostname: str, worker_id: int) -> bool:
+    """
+    Primary election via a non-blocking flock on the lock file.
+
+    One stdlib syscall, atomic across workers, and crash-safe: the lock
+    lives on the open fd, so it is released by the kernel if the holder is
+    OOM-killed, with no stale-file handling needed.
+    """
+    global _lock_fd
+    fd = os.open(LOCK_FILE, os.O_CREAT | os.O_WRONLY, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    os.ftruncate(fd, 0)
+    os.write(fd, f"{hostname}:{worker_id}".encode())
+    _lock_fd = fd
+    return True
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Imported here to keep these lifespan-only symbols out of the module
+    # namespace. Note this does NOT defer the pymilvus/grpc import itself:
+    # setup_routes pulls it in transitively at import time anyway (via
+    # rag_chain and tools.functions/embedding).
+    from app.RAG.vector_store import (
+        connect_to_milvus, load_all_milvus_collections,
+        unload_all_milvus_collections, disconnect_from_milvus,
+    )
+
     hostname, worker_id = socket.gethostname(), os.getpid()
     logger.info(f"Worker starting: host={hostname}, pid={worker_id}")
 
-    lock = FileLock(LOCK_FILE)        # always build the lock, file may pre-exist
-    try:
-        lock.acquire(timeout=0)       # non-blocking try
-        is_primary = True
-        try:
-            with open(LOCK_FILE, "w") as f:
-                f.write(f"{hostname}:{worker_id}")
-        except IOError as e:
-            logger.warning(f"Failed to write lock file: {e}")
-
+    # Primary election: flock on the lock file, released by the kernel if
+    # the holder crashes
+    is_primary = _try_acquire_primary_lock(hostname, worker_id)
+    if is_primary:
         # primary initialisation
         connect_to_milvus(True)
         load_all_milvus_collections()
         # app.state.sqs_task = asyncio.create_task(consume_forever())
-
-    except Timeout:
-        is_primary = False
+    else:
         logger.info(f"{hostname}:{worker_id} is SECONDARY (lock busy)")
         connect_to_milvus(False)
 
+    # Warm the voice agent path in the background so the first voice turn
+    # doesn't pay DNS/TLS and cold retrieval costs (every worker benefits).
+    # Keep a reference - the loop only holds tasks weakly.
+    from app.api.voice.services.voice_session import prewarm_voice_stack
+    app.state.prewarm_task = asyncio.create_task(prewarm_voice_stack(settings))
+
     # ── FastAPI runs ────────────────────────────────────────────
     yield
     # ── Shutdown ────────────────────────────────────────────────
@@ -54,9 +81,12 @@ async def lifespan(app: FastAPI):
         #     except asyncio.CancelledError:
         #         pass
         unload_all_milvus_collections()
-        lock.release()
+        global _lock_fd
+        if _lock_fd is not None:
+            os.close(_lock_fd)  # releases the flock
+            _lock_fd = None
         try:
-            os.remove(LOCK_FILE)
+            os.unlink(LOCK_FILE)
         except FileNotFoundError:
             pass
         logger.info("Released lock and cleaned up")
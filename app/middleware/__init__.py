@@ -13,7 +13,7 @@ def setup_middlewares(app: FastAPI):
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.CORS_ORIGINS,  # Configure this appropriately for production
+        allow_origins=settings.CORS_ORIGIN_LIST,  # Configure this appropriately for production
         allow_credentials=True,
         allow_methods=settings.CORS_METHODS,
         allow_headers=settings.CORS_HEADERS,
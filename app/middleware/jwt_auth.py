@@ -1,3 +1,4 @@
+import re
 from fastapi import HTTPException, Request, FastAPI
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from loguru import logger
@@ -17,38 +18,49 @@ PUBLIC_PATHS = [
 class JWTAuthMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: FastAPI, exclude_paths=None):
         super().__init__(app)
-        self.exclude_paths = exclude_paths or PUBLIC_PATHS
+        # Tuple so public-path checks are one C-level startswith call
+        self.exclude_paths = tuple(exclude_paths or PUBLIC_PATHS)
+        # Anchored alternation compiled once: the whole public-path check is
+        # a single C regex match per request
+        self._public_match = re.compile(
+            "^(?:" + "|".join(re.escape(p) for p in self.exclude_paths) + ")"
+        ).match
         self.valid_routes = None  # Initialize as None
+        self.valid_paths = None   # frozenset of paths for O(1) existence check
 
     def get_valid_routes(self, app: FastAPI):
         """ Extract all (path, method) pairs after app is fully initialized. """
         if self.valid_routes is None:
-            self.valid_routes = set()
+            valid_routes = set()
             for route in app.router.routes:
                 if hasattr(route, "path") and hasattr(route, "methods"):
                     for method in route.methods:
-                        self.valid_routes.add((route.path, method))
+                        valid_routes.add((route.path, method))
+            self.valid_routes = frozenset(valid_routes)
+            self.valid_paths = frozenset(path for path, _ in valid_routes)
         return self.valid_routes
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
         request_path = request.url.path
         request_method = request.method
 
+        # Public paths (incl. the WebSocket upgrade path) short-circuit
+        # before any route-table work or token parsing
+        if self._public_match(request_path) is not None:
+            return await call_next(request)
+
         # Ensure routes are extracted after app initialization
         valid_routes = self.get_valid_routes(request.app)
 
         # Check if the route exists with the correct method
         if (request_path, request_method) not in valid_routes:
             # Check if the path exists but method is incorrect → 405
-            if any(request_path == path for path, _ in valid_routes):
+            # O(1) frozenset lookup instead of a linear scan over all routes
+            if request_path in self.valid_paths:
                 return await call_next(request)
             # Otherwise, the route does not exist → 404
             return await call_next(request)
 
-        # Allow public paths without authentication
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-
         # Get Authorization header
         auth_header = request.headers.get("Authorization")
         # Validate Bearer token format
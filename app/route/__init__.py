@@ -1,4 +1,5 @@
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import HTTPException, RequestValidationError
 from app.api.auth.auth_controller import router as auth_router
 from app.api.document.document_controller import router as document_router
@@ -8,6 +9,14 @@ from app.utils.response import error_response
 from loguru import logger
 from fastapi import status
 
+# Pre-encoded bodies for the error responses 4xx storms hammer - avoids a
+# dict build + JSON encode per bad request
+_NOT_FOUND_BODY = orjson.dumps({"error": "The requested resource was not found"})
+_METHOD_NOT_ALLOWED_BODIES = {
+    method: orjson.dumps({"error": f"Method {method} not allowed for this endpoint"})
+    for method in ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+}
+
 def setup_routes(app: FastAPI):
     """Setup all routes for the application"""
 
@@ -17,7 +26,11 @@ def setup_routes(app: FastAPI):
             # Now distinguish between route not found and explicit raise
             if exc.detail == "Not Found":
                 # This is likely a route-missing 404 from FastAPI internals
-                return error_response("The requested resource was not found", status.HTTP_404_NOT_FOUND)
+                return Response(
+                    content=_NOT_FOUND_BODY,
+                    media_type="application/json",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
             else:
                 # This is an explicit raise HTTPException(404) with custom detail
                 logger.error(f"HTTP error: {exc.detail}")
@@ -28,7 +41,14 @@ def setup_routes(app: FastAPI):
     
     @app.exception_handler(405)
     async def method_not_allowed_handler(request: Request, exc: HTTPException):
-        return error_response(f"Method {request.method} not allowed for this endpoint", status.HTTP_405_METHOD_NOT_ALLOWED)
+        body = _METHOD_NOT_ALLOWED_BODIES.get(request.method)
+        if body is None:
+            return error_response(f"Method {request.method} not allowed for this endpoint", status.HTTP_405_METHOD_NOT_ALLOWED)
+        return Response(
+            content=body,
+            media_type="application/json",
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED
+        )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
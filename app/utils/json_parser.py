@@ -1,53 +1,68 @@
 import re
 import json
+import orjson
 from loguru import logger
 
+# All patterns compiled once at import - clean_json_string runs on every
+# chat LLM response, so per-call re.sub pattern lookups are pure overhead
+_JSON_FENCE_RE = re.compile(r'```json\s*|\s*```')
+_KEY_QUOTE_RE = re.compile(r'(?<!\\)"([^"]*?)(?<!\\)":')
+_BOOL_RE = re.compile(r'"(true|false)"', re.IGNORECASE)
+_BOOL_VALUE_RE = re.compile(r':\s*"(true|false)"', re.IGNORECASE)
+_YES_NO_PAIR_RE = re.compile(r'([,{])\s*"([^"]+)":\s*"(yes|no)"', re.IGNORECASE)
+_LIST_RE = re.compile(r'\[([^\]]*?)\]')
+_LIST_ITEM_RE = re.compile(r'"[^"]*"|\'[^\']*\'|\S+')
+_NUMBER_RE = re.compile(r'^-?\d+(\.\d+)?$')
+_AI_FIELD_RE = re.compile(r'"ai"\s*:\s*"(.*?)(?="\s*,\s*"[^"]+":|"\s*})', re.DOTALL)
+_DOC_REFS_RE = re.compile(r'"document_references"\s*:\s*\[([^\]]*)\]', re.DOTALL)
+_TITLE_RE = re.compile(r'"title"\s*:\s*"([^"]*)"')
+
 def clean_json_string(json_str):
     """Clean and normalize JSON string before parsing"""
 
     # Remove any markdown code block markers
-    json_str = re.sub(r'```json\s*|\s*```', '', json_str)
-    
+    json_str = _JSON_FENCE_RE.sub('', json_str)
+
     # Fix common JSON formatting issues
-    json_str = re.sub(r'(?<!\\)"([^"]*?)(?<!\\)":', r'"\1":', json_str)  # Fix key quotes
-    
+    json_str = _KEY_QUOTE_RE.sub(r'"\1":', json_str)  # Fix key quotes
+
     # Convert string booleans to proper JSON booleans
-    json_str = re.sub(r'"(true|false)"', r'\1', json_str, flags=re.IGNORECASE)
-    json_str = re.sub(r':\s*"(true|false)"', lambda m: ': ' + m.group(1).lower(), json_str, flags=re.IGNORECASE)
-    json_str = re.sub(r'([,{])\s*"([^"]+)":\s*"(yes|no)"', lambda m: f'{m.group(1)} "{m.group(2)}": {m.group(3).lower()}', json_str, flags=re.IGNORECASE)  # Full key-value pairs
-    
+    json_str = _BOOL_RE.sub(r'\1', json_str)
+    json_str = _BOOL_VALUE_RE.sub(lambda m: ': ' + m.group(1).lower(), json_str)
+    json_str = _YES_NO_PAIR_RE.sub(lambda m: f'{m.group(1)} "{m.group(2)}": {m.group(3).lower()}', json_str)  # Full key-value pairs
+
     # Fix list formatting issues
-    json_str = re.sub(r'\[([^\]]*?)\]', lambda m: normalize_list_string(m.group(1)), json_str)
-    
+    json_str = _LIST_RE.sub(lambda m: normalize_list_string(m.group(1)), json_str)
+
     return json_str.strip()
 
 def normalize_list_string(list_str):
     """Normalize the format of list strings"""
     if not list_str.strip():
         return '[]'
-    
+
     # Split by comma, handling both quoted and unquoted values
-    items = re.findall(r'"[^"]*"|\'[^\']*\'|\S+', list_str)
-    
+    items = _LIST_ITEM_RE.findall(list_str)
+
     # Clean and normalize each item
     normalized = []
     for item in items:
         item = item.strip(' ,"\'')  # Remove quotes and extra spaces
         if item:  # Skip empty items
             # Add quotes if it's not a number
-            if not re.match(r'^-?\d+(\.\d+)?$', item):
+            if not _NUMBER_RE.match(item):
                 item = f'"{item}"'
             normalized.append(item)
-    
+
     return f'[{",".join(normalized)}]'
 
 def parse_json_response(response_string):
     """Parse JSON response with robust error handling"""
     try:
-        # First try direct JSON parsing
-        return json.loads(response_string)
-    except json.JSONDecodeError:
-        # Clean and try again
+        # Fast path: orjson parses well-formed LLM output directly
+        return orjson.loads(response_string)
+    except orjson.JSONDecodeError:
+        # Clean and try again - stdlib json is more lenient on the fallback
         cleaned_json = clean_json_string(response_string)
         try:
             return json.loads(cleaned_json)
@@ -66,12 +81,12 @@ def extract_fields_with_regex(text):
     }
 
     # Extract AI response
-    ai_match = re.search(r'"ai"\s*:\s*"(.*?)(?="\s*,\s*"[^"]+":|"\s*})', text, re.DOTALL)
+    ai_match = _AI_FIELD_RE.search(text)
     if ai_match:
         result["ai"] = ai_match.group(1).replace('\\n', '\n').replace('\\"', '"')
-    
+
     # Extract document references
-    refs_match = re.search(r'"document_references"\s*:\s*\[([^\]]*)\]', text, re.DOTALL)
+    refs_match = _DOC_REFS_RE.search(text)
     if refs_match:
         refs_str = refs_match.group(1).strip()
         if refs_str:
@@ -80,8 +95,8 @@ def extract_fields_with_regex(text):
             result["document_references"] = refs
 
     # Extract title
-    title_match = re.search(r'"title"\s*:\s*"([^"]*)"', text)
+    title_match = _TITLE_RE.search(text)
     if title_match:
         result["title"] = title_match.group(1)
 
-    return result
\ No newline at end of file
+    return result
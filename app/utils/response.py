@@ -1,17 +1,17 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import Any
 from pydantic import BaseModel
 
-def success_response(data: Any, status_code: int = 200) -> JSONResponse:
+def success_response(data: Any, status_code: int = 200) -> ORJSONResponse:
     if isinstance(data, BaseModel):
         data = data.model_dump()
-    return JSONResponse(
+    return ORJSONResponse(
         content={"result": data},
         status_code=status_code
     )
 
-def error_response(error: str, status_code: int = 400) -> JSONResponse:
-    return JSONResponse(
+def error_response(error: str, status_code: int = 400) -> ORJSONResponse:
+    return ORJSONResponse(
         content={"error": error},
         status_code=status_code
     )
\ No newline at end of file
@@ -4,22 +4,85 @@ from typing import List, Dict, Any, Set
 
 from .json_parser import parse_json_response
 
+# Hot patterns compiled once at import - these run on every chat response
+_PAGE_RE = re.compile(r'Page\s+(\d+)', re.IGNORECASE)
+_CONTEXT_RE = re.compile(r'Context\s+(\d+)', re.IGNORECASE)
+
+
+def _strip_references(s: str) -> str:
+    """
+    Drop a trailing "References:" section from the "ai" value in one pass.
+
+    Replaces a regex whose three nested lazy wildcards could backtrack
+    quadratically on long LLM answers: locate the value with str.find, walk
+    it once honoring backslash escapes, and cut at the References marker.
+    """
+    key = s.find('"ai"')
+    if key == -1:
+        return s
+    open_q = s.find('"', s.find(':', key + 4) + 1)
+    if open_q == -1:
+        return s
+
+    # Walk to the closing quote of the value, honoring escapes
+    i = open_q + 1
+    n = len(s)
+    while i < n:
+        c = s[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '"':
+            break
+        i += 1
+    if i >= n:
+        return s
+
+    value = s[open_q + 1:i]
+    # Case-insensitive like the regex this replaced
+    marker = value.lower().rfind('references:')
+    if marker == -1:
+        return s
+
+    head = value[:marker].rstrip()
+    # Trim any separator tail the model emitted before the marker
+    # (escaped newlines and horizontal rules like \n---\n)
+    while head.endswith('\\n') or head.endswith('-'):
+        head = head[:-2] if head.endswith('\\n') else head[:-1]
+        head = head.rstrip()
+    return s[:open_q + 1] + head + s[i:]
+
+
+def _as_ref(ref: Any) -> Any:
+    """Coerce a document reference to int, or None if it isn't numeric.
+
+    try/int is faster than the str(ref).strip().isdigit() dance for the
+    common int/digit-string cases and avoids the str() round trip.
+    """
+    try:
+        return ref if isinstance(ref, int) else int(str(ref).strip())
+    except (ValueError, TypeError):
+        return None
+
 
 def format_page_number(page_number: Any) -> Any:
     """
     Extract the numerical value from a page number string.
+    Exact-type dispatch keeps the dominant int/digit-string cases to a
+    couple of opcodes.
     """
-    if not page_number:
-        return ""
-    if isinstance(page_number, int):
-        return page_number
-    if isinstance(page_number, str):
+    t = type(page_number)
+    if t is int:
+        return page_number if page_number else ""
+    if t is str:
+        if not page_number:
+            return ""
         if page_number.isdigit():
             return int(page_number)
-        match = re.search(r'Page\s+(\d+)', page_number, flags=re.IGNORECASE)
-        if match:
+        if (match := _PAGE_RE.search(page_number)):
             return int(match.group(1))
-    return page_number
+        return page_number
+    return page_number if page_number else ""
 
 def format_rag_response(response: Dict, user_query: str) -> Dict:
     """
@@ -33,11 +96,7 @@ def format_rag_response(response: Dict, user_query: str) -> Dict:
         logger.info(f"Processing response. Tool(s): {tool_names}")
 
         # Clean and parse JSON response
-        cleaned = re.sub(
-            r'(?is)("ai"\s*:\s*")([\s\S]*?)(?:\\n(?:-{3,}\\n|\\n)?\s*)?[^\n\\]*\bReferences:[\s\S]*?(")',
-            r'\1\2\3',
-            response_string
-        )
+        cleaned = _strip_references(response_string)
         
         json_response = parse_json_response(cleaned)
         # Determine if context was utilized based on tool usage
@@ -59,91 +118,65 @@ def format_rag_response(response: Dict, user_query: str) -> Dict:
         if not tool_names:
             return formatted_response
 
-        # Extract references
-        doc_refs = json_response.get("document_references", [])
-        
-        # If retrieval happened but no refs, we might want to be smart. 
-        # But strictly following logic: extract references if present.
-        
-        processed_refs = []
-        if doc_refs:
-            try:
-                processed_refs = [int(ref) for ref in doc_refs if str(ref).strip().isdigit()]
-            except Exception:
-                pass
-        
-        # If no explicit refs but tools used, check if we should fallback
-        if not processed_refs and tool_names:
-             # For retrieval, we did regex fallback.
-             # For other tools (search, weather), if no refs, we typically want to show what was used.
-             if is_retrieval:
-                 # Logic already handled or we accept empty if regex failed? 
-                 # Let's retry regex strictly on response string just in case
-                 found_refs = re.findall(r'Context\s+(\d+)', formatted_response["response"], re.IGNORECASE)
-                 if found_refs:
-                     processed_refs = [int(r)-1 for r in found_refs]
-             else:
-                 # For search/weather, include all items by default if no specific citations
-                 processed_refs = list(range(len(context_list)))
-
+        # Nothing to reference - skip all ref parsing and regex fallbacks
         if not context_list:
             return formatted_response
 
-        seen_texts: Set[str] = set()
+        # Extract references
+        doc_refs = json_response.get("document_references", [])
+
+        seen_hashes: Set[int] = set()
         meta_data: List[Dict] = []
-        
-        target_indices = processed_refs if processed_refs else []
-        
-        if not target_indices and not is_retrieval and context_list:
-             target_indices = list(range(len(context_list)))
-        
+
+        # Single pass over the references (1-based -> 0-based indices)
         final_indices = []
-        
+
         if doc_refs:
-             for ref in doc_refs:
-                 if str(ref).strip().isdigit():
-                     final_indices.append(int(ref) - 1)
-        
-        # Case 2: Regex Falback (Context 1 -> 0)
+            final_indices = [v - 1 for v in map(_as_ref, doc_refs) if v is not None]
+
+        # Case 2: Regex fallback (Context 1 -> 0)
         elif is_retrieval:
-             found_refs = re.findall(r'Context\s+(\d+)', formatted_response["response"], re.IGNORECASE)
-             for r in found_refs:
-                 final_indices.append(int(r) - 1)
-        
+            for r in _CONTEXT_RE.findall(formatted_response["response"]):
+                final_indices.append(int(r) - 1)
+
         # Case 3: Non-retrieval fallback (All items)
-        elif not is_retrieval and tool_names:
-             final_indices = list(range(len(context_list)))
-             
+        else:
+            final_indices = list(range(len(context_list)))
+
         # Process unique valid indices
         unique_indices = sorted(list(set([i for i in final_indices if 0 <= i < len(context_list)])))
         
         for i in unique_indices:
             context_item = context_list[i]
-            meta_item = {}
-            text_preview = ""
-            
-            if hasattr(context_item, 'page_content') and hasattr(context_item, 'metadata'):
-                metadata = context_item.metadata
-                text_preview = context_item.page_content[:50]
-                file_name = metadata.get("file_name", "Unknown File")
-                meta_item = {
-                    "text": context_item.page_content,
-                    "page": format_page_number(metadata.get("page_number", "")),
-                    "file_id": metadata.get("file_id", ""),
-                    "file_name": file_name,
-                    "title": file_name,
-                    "file_path": metadata.get("file_path", "")
-                }
-
-            elif isinstance(context_item, dict):
-                meta_item = context_item.copy()
+
+            # Dict items (search/weather results) take the cheap path: no
+            # attribute probing, no preview slicing, no dedup (as before)
+            if isinstance(context_item, dict):
                 # User request: title should be empty if not retrieval
-                meta_item["title"] = ""
-                meta_data.append(meta_item)
+                meta_data.append({**context_item, "title": ""})
+                continue
+
+            page_content = getattr(context_item, 'page_content', None)
+            metadata = getattr(context_item, 'metadata', None)
+            if page_content is None or metadata is None:
+                continue
+
+            # Dedup on the preview hash before any dict building - the
+            # sliced string is throwaway, only its hash is retained
+            preview_hash = hash(page_content[:50])
+            if preview_hash in seen_hashes:
                 continue
-            if meta_item and text_preview not in seen_texts:
-                seen_texts.add(text_preview)
-                meta_data.append(meta_item)
+            seen_hashes.add(preview_hash)
+            mg = metadata.get
+            file_name = mg("file_name", "Unknown File")
+            meta_data.append({
+                "text": page_content,
+                "page": format_page_number(mg("page_number", "")),
+                "file_id": mg("file_id", ""),
+                "file_name": file_name,
+                "title": file_name,
+                "file_path": mg("file_path", "")
+            })
         formatted_response["meta_data"] = meta_data
         return formatted_response
 
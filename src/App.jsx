@@ -89,17 +89,10 @@ function App() {
     isPlayingRef.current = true;
 
     while (audioQueueRef.current.length > 0) {
-      const audioBase64 = audioQueueRef.current.shift();
+      const audioData = audioQueueRef.current.shift();
 
       try {
-        const binaryString = atob(audioBase64);
-        const len = binaryString.length;
-        const bytes = new Uint8Array(len);
-        for (let i = 0; i < len; i++) {
-          bytes[i] = binaryString.charCodeAt(i);
-        }
-
-        const pcmData = new Int16Array(bytes.buffer);
+        const pcmData = new Int16Array(audioData);
         const floatData = new Float32Array(pcmData.length);
         for (let i = 0; i < pcmData.length; i++) {
           floatData[i] = pcmData[i] / 32768.0;
@@ -145,6 +138,7 @@ function App() {
     const wsUrl = `${WS_URL}/api/ws/voice/${sessionIdRef.current}`;
     console.log(`[WS] 🔌 Connecting to: ${wsUrl}`);
     const ws = new WebSocket(wsUrl);
+    ws.binaryType = 'arraybuffer';
 
     ws.onopen = () => {
       console.log('[WS] ✅ WebSocket connected successfully');
@@ -152,6 +146,16 @@ function App() {
     };
 
     ws.onmessage = (event) => {
+      // Binary frames are raw PCM16 audio chunks from the agent
+      if (event.data instanceof ArrayBuffer) {
+        audioQueueRef.current.push(event.data);
+        if (playbackContextRef.current.state === 'suspended') {
+          playbackContextRef.current.resume();
+        }
+        playNextAudioChunk();
+        return;
+      }
+
       const data = JSON.parse(event.data);
 
       switch (data.type) {
@@ -215,13 +219,24 @@ function App() {
           finalizeResponse();
           break;
 
-        case 'audio_chunk':
-          audioQueueRef.current.push(data.audio);
+        case 'audio_stream_meta':
+          console.log(`Audio stream: ${data.encoding} @ ${data.sample_rate}Hz`);
+          break;
+
+        case 'audio_chunk': {
+          // Legacy base64 fallback - decode once and queue raw PCM16
+          const binaryString = atob(data.audio);
+          const bytes = new Uint8Array(binaryString.length);
+          for (let i = 0; i < binaryString.length; i++) {
+            bytes[i] = binaryString.charCodeAt(i);
+          }
+          audioQueueRef.current.push(bytes.buffer);
           if (playbackContextRef.current.state === 'suspended') {
             playbackContextRef.current.resume();
           }
           playNextAudioChunk();
           break;
+        }
 
         case 'error':
           console.error('[WS] ❌ Server error:', data.message);
@@ -287,15 +302,6 @@ function App() {
     accumulatedResponseRef.current = '';  // Reset accumulated response
   };
 
-  const arrayBufferToBase64 = (buffer) => {
-    const bytes = new Uint8Array(buffer);
-    let binary = '';
-    for (let i = 0; i < bytes.byteLength; i++) {
-      binary += String.fromCharCode(bytes[i]);
-    }
-    return window.btoa(binary);
-  };
-
   const handleRecordingStart = async () => {
     try {
       if (connectionStatus === 'error') {
@@ -372,11 +378,8 @@ function App() {
           if (event.data.type === 'audio' &&
             websocketRef.current?.readyState === WebSocket.OPEN &&
             !isAssistantSpeakingRef.current) {
-            const base64Data = arrayBufferToBase64(event.data.buffer);
-            websocketRef.current.send(JSON.stringify({
-              type: 'audio_chunk',
-              audio_data: base64Data
-            }));
+            // Raw binary frame - no base64/JSON inflation on the mic path
+            websocketRef.current.send(event.data.buffer);
           }
         };
 
@@ -399,11 +402,8 @@ function App() {
               const s = Math.max(-1, Math.min(1, inputData[i]));
               int16Array[i] = s < 0 ? s * 0x8000 : s * 0x7FFF;
             }
-            const base64Data = arrayBufferToBase64(int16Array.buffer);
-            websocketRef.current.send(JSON.stringify({
-              type: 'audio_chunk',
-              audio_data: base64Data
-            }));
+            // Raw binary frame - no base64/JSON inflation on the mic path
+            websocketRef.current.send(int16Array.buffer);
           }
         };
 
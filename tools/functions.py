@@ -2,8 +2,14 @@
 Tool execution functions for DeepSeek function calling.
 All tool implementations with proper token tracking and detailed logging.
 """
+import asyncio
+import json
 import os
-from typing import List, Dict, Optional,Any
+import threading
+import time
+from functools import lru_cache
+from typing import List, Dict, Optional,Any, Union
+import numpy as np
 from dotenv import load_dotenv
 from loguru import logger
 from pymilvus import Collection, connections, utility
@@ -15,8 +21,127 @@ import requests
 
 load_dotenv()
 
+# Read once at import instead of per call; the shared Session keeps TLS
+# connections to the weather API alive across calls
+_OPENWEATHER_KEY = os.getenv("OPENWEATHER_API_KEY")
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Milvus handshake and collection.load() are expensive RPCs - pay them once
+# per process instead of on every retrieval
+_milvus_connected = False
+_COLLECTION_CACHE: Dict[str, Collection] = {}
+
+
+def _ensure_milvus_connection():
+    global _milvus_connected
+    if not _milvus_connected:
+        connections.connect(
+            uri=settings.MILVUS_URI,
+            db_name=settings.MILVUS_DB_NAME,
+            token=settings.MILVUS_TOKEN
+        )
+        _milvus_connected = True
+
+
+def _get_collection(collection_name: str) -> Optional[Collection]:
+    """Get a loaded Collection, cached so load() runs once per collection.
+
+    Only positive lookups are cached: collections are created at runtime by
+    document ingestion, so a remembered "does not exist" would go stale.
+    """
+    collection = _COLLECTION_CACHE.get(collection_name)
+    if collection is None:
+        if not utility.has_collection(collection_name):
+            return None
+        collection = Collection(name=collection_name)
+        collection.load()
+        _COLLECTION_CACHE[collection_name] = collection
+    return collection
+
+
+# Two-tier retrieval cache: an exact-match tier keyed on the normalized
+# query short-circuits both the embedding call and the ANN search; a
+# semantic tier matches near-duplicate queries by embedding similarity and
+# skips the search round trip
+_RETRIEVAL_CACHE_TTL = 300.0
+_RETRIEVAL_CACHE_MAX = 128
+_SEMANTIC_THRESHOLD = 0.95
+_retrieval_cache: Dict[tuple, tuple] = {}
+_semantic_entries: List[tuple] = []
+# Tool calls run concurrently from worker threads (asyncio.to_thread +
+# gather), so evict/insert must not race
+_cache_lock = threading.Lock()
+
+
+def _retrieval_cache_get(key: tuple):
+    entry = _retrieval_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _retrieval_cache.pop(key, None)
+        return None
+    return entry[1]
+
+
+def _retrieval_cache_put(key: tuple, query_vector, result: tuple):
+    expires_at = time.monotonic() + _RETRIEVAL_CACHE_TTL
+    vec = np.asarray(query_vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+
+    with _cache_lock:
+        if len(_retrieval_cache) >= _RETRIEVAL_CACHE_MAX:
+            oldest = next(iter(_retrieval_cache), None)
+            if oldest is not None:
+                _retrieval_cache.pop(oldest, None)
+        _retrieval_cache[key] = (expires_at, result)
+
+        if norm > 0:
+            if len(_semantic_entries) >= _RETRIEVAL_CACHE_MAX:
+                _semantic_entries.pop(0)
+            # scope = everything but the query text (collection, filters and
+            # retrieval profile) so hits never cross filters or result shapes
+            _semantic_entries.append((expires_at, key[1:], vec / norm, result))
+
+
+def _semantic_lookup(scope: tuple, query_vector):
+    now = time.monotonic()
+    vec = np.asarray(query_vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return None
+    vec = vec / norm
+    with _cache_lock:
+        entries = list(_semantic_entries)
+    for expires_at, entry_scope, entry_vec, result in entries:
+        if expires_at < now or entry_scope != scope:
+            continue
+        if float(entry_vec @ vec) >= _SEMANTIC_THRESHOLD:
+            return result
+    return None
+
+
+# The shared embedder's token counter is cumulative (and its += is a
+# non-atomic read-modify-write), so the embed-call + counter-delta window
+# must be serialized across the worker threads running concurrent tool calls
+_embed_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _get_embedder(model: str) -> VoyageEmbeddings:
+    """One embedding client per model - reuses the HTTP session and config
+    instead of rebuilding them on every retrieval."""
+    return VoyageEmbeddings(
+        model=model,
+        api_key=settings.VOYAGE_API_KEY,
+        batch_size=128,
+        truncation=True
+    )
+
+
+@lru_cache(maxsize=1)
 def _get_perplexity_client() -> Perplexity:
-    """Get Perplexity API client."""
+    """Get Perplexity API client (built once per process)."""
     api_key = os.getenv("PERPLEXITY_API_KEY")
     if not api_key:
         raise ValueError("PERPLEXITY_API_KEY environment variable is required for web search")
@@ -34,7 +159,7 @@ def search_articles(query: str, max_results: int = 2) -> List[Dict]:
     Returns:
         List of search results with title, url, content
     """
-    logger.info(f"[PERPLEXITY] query='{query}' | max_results={max_results}")
+    logger.debug(f"[PERPLEXITY] query='{query}' | max_results={max_results}")
     client = _get_perplexity_client()
     
     try:
@@ -52,7 +177,7 @@ def search_articles(query: str, max_results: int = 2) -> List[Dict]:
             }
             results.append(norm)
         
-        logger.info(f"[PERPLEXITY] Found {len(results)} results")
+        logger.debug(f"[PERPLEXITY] Found {len(results)} results")
         return results[:max_results]
     except Exception as e:
         logger.error(f"[PERPLEXITY] Search failed: {e}")
@@ -69,9 +194,9 @@ def get_current_weather(location: str, unit: str = "celsius") -> Dict:
     Returns:
         Weather information dictionary
     """
-    logger.info(f"[WEATHER] location='{location}' | unit={unit}")
+    logger.debug(f"[WEATHER] location='{location}' | unit={unit}")
     
-    api_key = os.getenv("OPENWEATHER_API_KEY")
+    api_key = _OPENWEATHER_KEY
     if not api_key:
         logger.warning("[WEATHER] Missing OPENWEATHER_API_KEY, using mock data")
         # Fallback to mock data
@@ -100,7 +225,7 @@ def get_current_weather(location: str, unit: str = "celsius") -> Dict:
     }
     
     try:
-        response = requests.get(base_url, params=params, timeout=10)
+        response = _SESSION.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -115,7 +240,7 @@ def get_current_weather(location: str, unit: str = "celsius") -> Dict:
             "type": "weather"
         }
         
-        logger.info(f"[WEATHER] Successfully fetched weather for {location}")
+        logger.debug(f"[WEATHER] Successfully fetched weather for {location}")
         return weather_info
         
     except Exception as e:
@@ -133,103 +258,143 @@ def get_current_weather(location: str, unit: str = "celsius") -> Dict:
         }
 
 def retrieve_documents(
-    query: str,
+    query: Union[str, List[str]],
     collection_name: str,
     file_ids: Optional[List[str]] = None,
-    top_k: int = 8
-) -> tuple[List[Document], Dict[str, int]]:
+    top_k: int = 8,
+    ef: int = 64,
+    output_fields: tuple = ("text", "file_id", "file_name", "file_path", "page_number", "chunk_number")
+) -> tuple[Union[List[Document], List[List[Document]]], Dict[str, int]]:
     """
     Retrieve relevant documents from Milvus with token tracking.
     
     Args:
-        query: Search query
+        query: Search query, or a list of queries searched as one batch
+            (multi-hop callers amortize embedding and search round trips)
         collection_name: Milvus collection name
         file_ids: Optional list of file IDs to filter by
         top_k: Number of documents to retrieve (default: 8)
+        ef: HNSW search breadth for recall/latency tuning (default: 64)
+        output_fields: Fields fetched from Milvus - callers that don't
+            need e.g. file_path can trim the wire payload
         
     Returns:
-        Tuple of (documents, token_usage)
+        Tuple of (documents, token_usage); documents is a list per query
+        when a list of queries is given
     """
-    logger.info(f"[RETRIEVAL] query='{query}' | collection={collection_name} | file_ids={file_ids}")
-    
+    logger.debug(f"[RETRIEVAL] query='{query}' | collection={collection_name} | file_ids={file_ids}")
+
     token_usage = {
         "embedding_tokens": 0
     }
-    
-    try:
-        # Connect to Milvus
-        connections.connect(
-            uri=settings.MILVUS_URI,
-            db_name=settings.MILVUS_DB_NAME,
-            token=settings.MILVUS_TOKEN
+
+    is_single = isinstance(query, str)
+
+    # Exact-match tier (single queries): skip embedding and search entirely
+    cache_key = None
+    if is_single:
+        # Key on the full retrieval profile (top_k/ef/output_fields vary by
+        # caller - voice and chat hit the same collection with different
+        # profiles, and a hit must never serve the wrong shape)
+        cache_key = (
+            query.strip().lower(), collection_name, tuple(sorted(file_ids or ())),
+            top_k, ef, tuple(output_fields)
         )
-        
-        # Check if collection exists
-        if not utility.has_collection(collection_name):
+        cached = _retrieval_cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"[RETRIEVAL] Cache hit (exact) for query='{query}'")
+            return cached[0], token_usage
+
+    try:
+        # Connect to Milvus (once per process) and fetch the cached,
+        # already-loaded collection
+        _ensure_milvus_connection()
+
+        collection = _get_collection(collection_name)
+        if collection is None:
             logger.warning(f"[RETRIEVAL] Collection {collection_name} does not exist")
             return [], token_usage
         
-        # Load collection
-        collection = Collection(name=collection_name)
-        collection.load()
-        
-        # Initialize embedding
-        embedding = VoyageEmbeddings(
-            model="voyage-3-large",
-            api_key=settings.VOYAGE_API_KEY,
-            batch_size=128,
-            truncation=True
-        )
-        
-        # Generate query embedding
-        logger.info(f"[RETRIEVAL] Generating embedding for query...")
-        query_vector = embedding.embed_query(query)
-        embedding_tokens = embedding.get_total_tokens()
+        # Shared embedding client - token counter is cumulative, so take a
+        # before/after delta for this call
+        embedding = _get_embedder("voyage-3-large")
+
+        # Generate query embedding(s) - a list of queries is embedded and
+        # searched as one batch. The before/after delta on the shared
+        # cumulative counter is only correct if no other call embeds inside
+        # the window, hence the lock.
+        logger.debug(f"[RETRIEVAL] Generating embedding for query...")
+        with _embed_lock:
+            tokens_before = embedding.get_total_tokens()
+            if is_single:
+                query_vectors = [embedding.embed_query(query)]
+            else:
+                query_vectors = embedding.embed_documents(list(query))
+            embedding_tokens = embedding.get_total_tokens() - tokens_before
         token_usage["embedding_tokens"] = embedding_tokens
-        logger.info(f"[RETRIEVAL] Embedding generated | tokens={embedding_tokens}")
+        logger.debug(f"[RETRIEVAL] Embedding generated | tokens={embedding_tokens}")
+
+        # Semantic tier: near-duplicate queries reuse the cached search result
+        if is_single:
+            semantic_hit = _semantic_lookup(cache_key[1:], query_vectors[0])
+            if semantic_hit is not None:
+                logger.info(f"[RETRIEVAL] Cache hit (semantic) for query='{query}'")
+                return semantic_hit[0], token_usage
         
         # Build search expression for file filtering
         search_params = {
             "metric_type": "COSINE",
-            "params": {"ef": 64}
+            "params": {"ef": ef}
         }
         
         expr = None
         if file_ids:
-            expr = " or ".join([f'file_id == "{fid}"' for fid in file_ids])
-            logger.info(f"[RETRIEVAL] Filtering by file_ids: {file_ids}")
+            # Single IN predicate instead of an O(n) OR-chain - one clause for
+            # Milvus to plan, and json.dumps quotes the ids safely
+            expr = f'file_id in {json.dumps([str(fid) for fid in file_ids])}'
+            logger.debug(f"[RETRIEVAL] Filtering by file_ids: {file_ids}")
         
         # Search
-        logger.info(f"[RETRIEVAL] Searching Milvus for top {top_k} documents...")
+        logger.debug(f"[RETRIEVAL] Searching Milvus for top {top_k} documents...")
         results = collection.search(
-            data=[query_vector],
+            data=query_vectors,
             anns_field="vector",
             param=search_params,
             limit=top_k,
             expr=expr,
-            output_fields=["text", "file_id", "file_name", "file_path", "page_number", "chunk_number"]
+            output_fields=list(output_fields)
         )
         
-        # Convert results to documents
-        documents = []
-        if results and len(results) > 0:
-            for idx, hit in enumerate(results[0]):
-                doc = Document(
-                    page_content=hit.entity.get("text", ""),
+        # Convert results to documents, one list per query - list comps with
+        # hit.entity.get bound once per hit instead of eight lookups
+        docs_by_query: List[List[Document]] = [
+            [
+                Document(
+                    page_content=g("text", ""),
                     metadata={
-                        "file_id": hit.entity.get("file_id", ""),
-                        "file_name": hit.entity.get("file_name", ""),
-                        "file_path": hit.entity.get("file_path", ""),
-                        "page_number": hit.entity.get("page_number", ""),
-                        "chunk_number": hit.entity.get("chunk_number", 0),
+                        "file_id": g("file_id", ""),
+                        "file_name": g("file_name", ""),
+                        "file_path": g("file_path", ""),
+                        "page_number": g("page_number", ""),
+                        "chunk_number": g("chunk_number", 0),
                         "score": hit.score,
                         "index": idx
                     }
                 )
-                documents.append(doc)
-        
-        logger.info(f"[RETRIEVAL] Final result: {len(documents)} documents | total_tokens={token_usage}")
-        return documents, token_usage
+                for idx, hit in enumerate(hits)
+                for g in (hit.entity.get,)
+            ]
+            for hits in (results or [])
+        ]
+
+        if is_single:
+            documents = docs_by_query[0] if docs_by_query else []
+            logger.info(f"[RETRIEVAL] Final result: {len(documents)} documents | total_tokens={token_usage}")
+            _retrieval_cache_put(cache_key, query_vectors[0], (documents, token_usage))
+            return documents, token_usage
+
+        logger.info(f"[RETRIEVAL] Final result: {sum(len(d) for d in docs_by_query)} documents across {len(docs_by_query)} queries | total_tokens={token_usage}")
+        return docs_by_query, token_usage
         
     except Exception as e:
         logger.error(f"[RETRIEVAL] Error retrieving documents: {e}")
@@ -248,21 +413,100 @@ def format_documents_for_llm(documents: List[Document]) -> str:
     """
     if not documents:
         return "No relevant documents found."
-    
-    formatted = []
-    for i, doc in enumerate(documents):
-        file_name = doc.metadata.get('file_name', 'unknown')
-        page_number = doc.metadata.get('page_number', 'unknown')
-        content = doc.page_content
-        
-        formatted.append(
-            f"Context {i+1}:\n"
-            f"  Document: {file_name}\n"
-            f"  Reference: {page_number}\n"
-            f"  Content: {content}\n"
-        )
-    
-    return "\n".join(formatted)
+
+    # Single join over a generator - no intermediate list, and the metadata
+    # dict is bound once per document
+    return "\n".join(
+        f"Context {i+1}:\n"
+        f"  Document: {md.get('file_name', 'unknown')}\n"
+        f"  Reference: {md.get('page_number', 'unknown')}\n"
+        f"  Content: {doc.page_content}\n"
+        for i, doc in enumerate(documents)
+        for md in (doc.metadata,)
+    )
+
+
+def _handle_retrieve(function_args: Dict, collection_name: Optional[str], token_usage: Dict[str, int]) -> tuple[str, Any, Dict[str, int]]:
+    if not collection_name:
+        logger.error("[TOOL_EXEC] Collection name required for retrieval")
+        return "Error: Collection name required for document retrieval", [], token_usage
+
+    query = function_args.get("query", "")
+    file_ids = function_args.get("file_ids")
+
+    logger.debug(f"[TOOL_EXEC] Retrieving documents for query: '{query}'")
+
+    documents, retrieval_tokens = retrieve_documents(
+        query=query,
+        collection_name=collection_name,
+        file_ids=file_ids
+    )
+
+    # Update token usage
+    token_usage.update(retrieval_tokens)
+
+    result = format_documents_for_llm(documents)
+    logger.info(f"[TOOL_EXEC] Retrieved {len(documents)} documents | tokens={retrieval_tokens}")
+    logger.debug(f"[TOOL_EXEC] Result preview: {result}")
+
+    return result, documents, token_usage
+
+
+def _handle_search(function_args: Dict, collection_name: Optional[str], token_usage: Dict[str, int]) -> tuple[str, Any, Dict[str, int]]:
+    query = function_args.get("query", "")
+    max_results = function_args.get("max_results", 2)
+
+    logger.debug(f"[TOOL_EXEC] Searching articles for: '{query}'")
+
+    results = search_articles(query=query, max_results=max_results)
+
+    if not results:
+        result = f"No articles found for query: {query}"
+    else:
+        formatted = []
+        for i, article in enumerate(results):
+            formatted.append(
+                f"Article {i+1}:\n"
+                f"  Title: {article.get('title', 'N/A')}\n"
+                f"  URL: {article.get('url', 'N/A')}\n"
+                f"  Content: {article.get('content', 'N/A')}\n"
+            )
+        result = "\n".join(formatted)
+
+    logger.info(f"[TOOL_EXEC] Found {len(results)} articles")
+    logger.debug(f"[TOOL_EXEC] Result preview: {result}...")
+
+    return result, results, token_usage
+
+
+def _handle_weather(function_args: Dict, collection_name: Optional[str], token_usage: Dict[str, int]) -> tuple[str, Any, Dict[str, int]]:
+    location = function_args.get("location", "")
+    unit = function_args.get("unit", "celsius")
+
+    logger.debug(f"[TOOL_EXEC] Getting weather for: {location}")
+
+    weather = get_current_weather(location=location, unit=unit)
+
+    result = (
+        f"Weather in {weather['location']}:\n"
+        f"  Temperature: {weather['temperature']}°{weather['unit'][0].upper()}\n"
+        f"  Condition: {weather['condition']}\n"
+        f"  Humidity: {weather['humidity']}%\n"
+        f"  Wind Speed: {weather.get('wind_speed', 0)} km/h"
+    )
+
+    logger.debug(f"[TOOL_EXEC] Weather result: {result}")
+
+    return result, [weather], token_usage
+
+
+# O(1) tool dispatch - handlers share the (args, collection, token_usage)
+# signature so execute_tool stays a thin lookup
+_DISPATCH = {
+    "retrieve_documents": _handle_retrieve,
+    "search_articles": _handle_search,
+    "get_current_weather": _handle_weather,
+}
 
 
 def execute_tool(function_name: str, function_args: Dict, collection_name: Optional[str] = None) -> tuple[str, Any, Dict[str, int]]:
@@ -278,89 +522,35 @@ def execute_tool(function_name: str, function_args: Dict, collection_name: Optio
         Tuple of (formatted_result, raw_context, token_usage)
     """
     logger.info(f"[TOOL_EXEC] Executing {function_name}")
-    logger.info(f"[TOOL_EXEC] Arguments: {function_args}")
+    logger.debug(f"[TOOL_EXEC] Arguments: {function_args}")
     
     token_usage = {
         "embedding_tokens": 0
     }
     
     try:
-        if function_name == "retrieve_documents":
-            if not collection_name:
-                logger.error("[TOOL_EXEC] Collection name required for retrieval")
-                return "Error: Collection name required for document retrieval", [], token_usage
-            
-            query = function_args.get("query", "")
-            file_ids = function_args.get("file_ids")
-            
-            logger.info(f"[TOOL_EXEC] Retrieving documents for query: '{query}'")
-            
-            documents, retrieval_tokens = retrieve_documents(
-                query=query,
-                collection_name=collection_name,
-                file_ids=file_ids
-            )
-            
-            # Update token usage
-            token_usage.update(retrieval_tokens)
-            
-            result = format_documents_for_llm(documents)
-            logger.info(f"[TOOL_EXEC] Retrieved {len(documents)} documents | tokens={retrieval_tokens}")
-            logger.info(f"[TOOL_EXEC] Result preview: {result}")
-            
-            return result, documents, token_usage
-        
-        elif function_name == "search_articles":
-            query = function_args.get("query", "")
-            max_results = function_args.get("max_results", 2)
-            
-            logger.info(f"[TOOL_EXEC] Searching articles for: '{query}'")
-            
-            results = search_articles(query=query, max_results=max_results)
-            
-            if not results:
-                result = f"No articles found for query: {query}"
-            else:
-                formatted = []
-                for i, article in enumerate(results):
-                    formatted.append(
-                        f"Article {i+1}:\n"
-                        f"  Title: {article.get('title', 'N/A')}\n"
-                        f"  URL: {article.get('url', 'N/A')}\n"
-                        f"  Content: {article.get('content', 'N/A')}\n"
-                    )
-                result = "\n".join(formatted)
-            
-            logger.info(f"[TOOL_EXEC] Found {len(results)} articles")
-            logger.info(f"[TOOL_EXEC] Result preview: {result}...")
-            
-            return result, results, token_usage
-        
-        elif function_name == "get_current_weather":
-            location = function_args.get("location", "")
-            unit = function_args.get("unit", "celsius")
-            
-            logger.info(f"[TOOL_EXEC] Getting weather for: {location}")
-            
-            weather = get_current_weather(location=location, unit=unit)
-            
-            result = (
-                f"Weather in {weather['location']}:\n"
-                f"  Temperature: {weather['temperature']}°{weather['unit'][0].upper()}\n"
-                f"  Condition: {weather['condition']}\n"
-                f"  Humidity: {weather['humidity']}%\n"
-                f"  Wind Speed: {weather.get('wind_speed', 0)} km/h"
-            )
-            
-            logger.info(f"[TOOL_EXEC] Weather result: {result}")
-            
-            return result, [weather], token_usage
-        
-        else:
+        handler = _DISPATCH.get(function_name)
+        if handler is None:
             logger.error(f"[TOOL_EXEC] Unknown function: {function_name}")
             return f"Error: Unknown function '{function_name}'", [], token_usage
+        return handler(function_args, collection_name, token_usage)
     
     except Exception as e:
         logger.error(f"[TOOL_EXEC] Error executing {function_name}: {e}")
         return f"Error executing {function_name}: {str(e)}", [], token_usage
 
+
+async def execute_tool_async(function_name: str, function_args: Dict, collection_name: Optional[str] = None) -> tuple[str, Any, Dict[str, int]]:
+    """
+    Async wrapper around execute_tool.
+
+    The tool stack (embedding, Milvus, Perplexity, OpenWeatherMap) is
+    network-bound and synchronous, so it runs in a thread; callers can
+    asyncio.gather several tool calls and overlap their I/O.
+    """
+    return await asyncio.to_thread(
+        execute_tool,
+        function_name=function_name,
+        function_args=function_args,
+        collection_name=collection_name
+    )
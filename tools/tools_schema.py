@@ -75,4 +75,9 @@ weather_tool = {
             "required": ["location"]
         }
     }
-}
\ No newline at end of file
+}
+
+
+# Canonical tool list - callers reuse this tuple instead of rebuilding a
+# list per request
+ALL_TOOLS = (retrieval_tool, search_articles, weather_tool)
@@ -1,3 +1,4 @@
+import os
 import uvicorn
 import multiprocessing
 from app.config import settings  # Import your FastAPI settings
@@ -11,7 +12,12 @@ if ENV == "development":
 elif ENV == "production":
     reload = False
     log_level = "warning"
-    workers = multiprocessing.cpu_count() * 2 + 1
+    # Cap cpu*2+1: on large hosts it spawns hundreds of workers, each with
+    # its own Milvus connection and embedding client
+    workers = min(
+        multiprocessing.cpu_count() * 2 + 1,
+        int(os.getenv("MAX_WORKERS", "16"))
+    )
 else:
     raise ValueError(f"Unknown APP_ENV: {ENV}")
 
@@ -22,5 +28,9 @@ if __name__ == "__main__":
         port=settings.PORT,
         reload=reload,
         workers=workers,
-        log_level=log_level
+        log_level=log_level,
+        # uvloop + httptools (bundled with uvicorn[standard]) cut per-callback
+        # overhead on the WebSocket-heavy voice sessions vs the stock loop
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file